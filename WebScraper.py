@@ -1,18 +1,28 @@
-from metagpt.actions import Action
-from metagpt.roles.role import Role, RoleReactMode
-from metagpt.logs import logger
-from metagpt.schema import Message
-from metagpt.tools.web_browser_engine import WebBrowserEngine
+from startup import STARTUP_TIMER
+with STARTUP_TIMER.step("import metagpt"):
+    from metagpt.actions import Action
+    from metagpt.roles.role import Role, RoleReactMode
+    from metagpt.logs import logger
+    from metagpt.schema import Message
+    from metagpt.utils.text import generate_prompt_chunk, reduce_message_length
+    from metagpt.const import USE_CONFIG_TIMEOUT
 from typing import Any, Callable, Optional, Union
-from search_and_summarize import SearchAndSummarize
-from pydantic import model_validator, BaseModel
-from metagpt.utils.text import generate_prompt_chunk, reduce_message_length
+with STARTUP_TIMER.step("import search_and_summarize"):
+    from search_and_summarize import SearchAndSummarize
+from pydantic import BaseModel
 import requests
+import asyncio
 import io
-import fitz
-from metagpt.const import USE_CONFIG_TIMEOUT
 import os
+import re
 import yaml
+from urllib.parse import urlparse
+with STARTUP_TIMER.step("import html_extractor"):
+    from html_extractor import EXTRACTION_STATS, extract_links, extract_static_text
+with STARTUP_TIMER.step("import site_crawler"):
+    from site_crawler import CRAWLER_USER_AGENT, HostRateLimiter, RobotsRules, URLFrontier, origin
+with STARTUP_TIMER.step("import near_duplicate"):
+    from near_duplicate import get_summary_index, indexable, simhash
 SUMMARIZE_PROMPT = """
 You are a AI critical thinker url summarizer. Your sole purpose is to summarize the content of pages from websites or articles. 
 If there is no content to summarize, just give a description of what there is(like headers and titles). Keep your summaries within 2 sentences.
@@ -28,6 +38,34 @@ WEB_BROWSE_AND_SUMMARIZE_PROMPT = """### Requirements
 ### Content/Instructions
 {content}
 """
+
+EXTRACT_URLS_PROMPT = """Given this query: {query}; get every url from the query and respond with only the urls themselves, one per line. If there are none, respond with only 'NA'."""
+
+SYNTHESIZE_PROMPT = """### Requirements
+1. Below are summaries of several urls, each starting with its url.
+2. Write a short synthesis that compares them: what they agree on, where they differ and anything only one of them covers.
+3. Only use information present in the summaries.
+
+### Summaries
+{summaries}
+"""
+
+SITE_ROLLUP_PROMPT = """### Requirements
+1. Below is the running summary of a website so far, followed by summaries of more of its pages.
+2. Merge them into one updated summary of the whole site: its purpose, main sections and key facts.
+3. Keep it under 10 sentences and only use information present below.
+
+### Running Summary
+{rollup}
+
+### New Page Summaries
+{pages}
+"""
+
+CRAWL_CONTENT_TYPES = ("text/html", "application/pdf")
+
+URL_PATTERN = re.compile(r"https?://[^\s<>\"'`]+")
+
 class Report(BaseModel):
     topic: str
     links: dict[str, list[str]] = None
@@ -103,25 +141,95 @@ class AnswerQuestion(Action):
         resp = resp.json()
         return resp["choices"][0]["message"]["content"]
 
+class HostLimiter:
+    """
+    HostLimiter caps the number of concurrent requests sent to each host.
+    """
+    def __init__(self, max_per_host: int = 2):
+        self.max_per_host = max_per_host
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def __call__(self, url: str) -> asyncio.Semaphore:
+        """
+        Args:
+            url: The URL about to be requested.
+        Returns:
+            The semaphore guarding the URL's host.
+        """
+        host = urlparse(url).netloc.lower()
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._semaphores[host]
+
+def parse_urls(text: str) -> list[str]:
+    """
+    Get the unique URLs from an LLM response, in order.
+
+    Args:
+        text: The LLM response.
+    Returns:
+        A list of URLs.
+    """
+    urls = []
+    for match in URL_PATTERN.findall(text):
+        while match:
+            last = match[-1]
+            if last in ".,;:!?}'\"`*":
+                match = match[:-1]
+            # Keep closing brackets that are part of the URL, e.g. wiki/Python_(programming_language).
+            elif last in ")]" and match.count(last) > match.count("(" if last == ")" else "["):
+                match = match[:-1]
+            else:
+                break
+        if match and match not in urls:
+            urls.append(match)
+    return urls
+
+def read_pdf(data: bytes) -> str:
+    """
+    Get the text of every page of a PDF.
+
+    Args:
+        data: The raw PDF bytes.
+    Returns:
+        The PDF text.
+    """
+    import fitz
+
+    contents = ""
+    fileStream = io.BytesIO(data)
+    reader = fitz.open("pdf", fileStream)
+    for page in reader:
+        contents += page.get_text() + "\n"
+    reader.close()
+    return contents
+
 class URLSummarize(Action):
     """Action class to explore the web and provide summaries of articles and webpages."""
 
     name: str = "URLSummarize"
     i_context: Optional[str] = None
-    desc: str = "Provide summaries of articles and webpages."
+    desc: str = "Provide summaries of articles and webpages. Handles one or more urls."
     browse_func: Union[Callable[[list[str]], None], None] = None
-    web_browser_engine: Optional[WebBrowserEngine] = None
+    web_browser_engine: Optional[Any] = None  # WebBrowserEngine, created on first use
     content: Optional[str] = None
+    extraction_methods: dict[str, str] = {}
+    max_per_host: int = 2
+    synthesize: bool = True
+    use_summary_index: bool = True
+    language: str = "en-us"
 
-    @model_validator(mode="after")
-    def validate_engine_and_run_func(self):
+    def get_browser_engine(self):
+        """Create the browser engine on first use, most pages never need it."""
         if self.web_browser_engine is None:
+            from metagpt.tools.web_browser_engine import WebBrowserEngine
+
             self.web_browser_engine = WebBrowserEngine.from_browser_config(
                 self.config.browser,
                 browse_func=self.browse_func,
                 proxy=self.config.proxy,
             )
-        return self
+        return self.web_browser_engine
     # Optional: add event.wait and event.clear calls to every change to stepper.display_content for step-by-step execution
     async def run(
         self,
@@ -134,7 +242,7 @@ class URLSummarize(Action):
         """Run the action to browse the web and provide summaries.
 
         Args:
-            url: The main URL to browse.
+            url: The query containing one or more URLs to browse.
             system_text: The system text.
 
         Returns:
@@ -143,19 +251,79 @@ class URLSummarize(Action):
         if system_text is None:
             system_text  = SUMMARIZE_PROMPT
 
-        stepper.display_content += "DAVID(WEB_SUMMARIZER): Extracting URL from query and scraping URL contents.\n\n"
-        url = (await self._aask(f"Given this query: {url}; get the url from the query and respond with only the url itself, and if it does not exist, respond with only 'NA'.")).strip()
+        stepper.display_content += "DAVID(WEB_SUMMARIZER): Extracting URLs from query and scraping URL contents.\n\n"
+        urls = parse_urls(await self._aask(EXTRACT_URLS_PROMPT.format(query=url)))
 
-        if(url == 'NA'):
+        if not urls:
             return ["Couldn't get URL from the given query."]
-        
-        out = requests.get(url)
+
+        limiter = HostLimiter(self.max_per_host)
+        if len(urls) == 1:
+            return await self.summarize_url(stepper, event, urls[0], system_text, limiter)
+
+        stepper.display_content += f"DAVID(WEB_SUMMARIZER): Summarizing {len(urls)} URLs concurrently.\n\n"
+        results = {}
+
+        async def summarize(target: str):
+            try:
+                return target, await self.summarize_url(stepper, event, target, system_text, limiter)
+            except Exception as e:
+                logger.warning(f"Failed to summarize {target}: {e}")
+                stepper.display_content += f"DAVID(WEB_SUMMARIZER): Failed to summarize {target}: {e}\n\n"
+                return target, []
+
+        for finished in asyncio.as_completed([summarize(target) for target in urls]):
+            target, summaries = await finished
+            results[target] = summaries
+            stepper.display_content += f"DAVID(WEB_SUMMARIZER): Finished {target}:\n" + "\n".join(summaries) + "\n\n"
+
+        summaries = [f"{target}:\n" + "\n".join(results[target]) for target in urls if results[target]]
+        if not summaries:
+            return ["Couldn't fetch any of the URLs in the given query."]
+        if self.synthesize and len(summaries) > 1:
+            stepper.display_content += "DAVID(WEB_SUMMARIZER): Synthesizing summaries across URLs.\n\n"
+            summaries.append(await self._aask(SYNTHESIZE_PROMPT.format(summaries="\n\n".join(summaries)), [system_text]))
+        return summaries
+
+    async def summarize_url(self, stepper, event, url: str, system_text: str, limiter: HostLimiter) -> list[str]:
+        """Fetch, extract and summarize a single URL.
+
+        Args:
+            url: The URL to browse.
+            system_text: The system text.
+            limiter: The per-host concurrency limiter.
+
+        Returns:
+            A list with summaries, empty if the URL could not be fetched.
+        """
+        out = await self.fetch(url, limiter)
+        if out is None:
+            stepper.display_content += f"Invalid URL: {url}\n\n"
+            return []
+        content = await self.extract(stepper, url, out, limiter)
+        return await self.summarize_content(stepper, event, content, system_text, url=url)
+
+    async def fetch(self, url: str, limiter: HostLimiter) -> Optional[requests.Response]:
+        """Download a URL, returning None if it is unreachable or does not respond with 200."""
+        async with limiter(url):
+            try:
+                out = await asyncio.to_thread(requests.get, url, timeout=30)
+            except requests.RequestException as e:
+                print(f"Failed to fetch {url} in URLSummarize(): {e}")
+                return None
         if(out.status_code != 200):
             print("Invalid URL in URLSummarize()")
-            stepper.display_content +=  "Invalid URL\n\n"
-            return ""
-        
-        type = out.headers.get("content-type")
+            return None
+        return out
+
+    async def extract(self, stepper, url: str, out: requests.Response, limiter: HostLimiter, data: Optional[bytes] = None) -> str:
+        """Get the text content of a fetched page, using the browser engine only when the static HTML is not enough.
+
+        data overrides out.content for responses that were downloaded in streaming mode.
+        """
+        type = out.headers.get("content-type") or ""
+        if data is None:
+            data = out.content
 
         if 'text/html' in type:
             site_type = 0
@@ -168,34 +336,68 @@ class URLSummarize(Action):
             site_type = 0
         
         if site_type == 0:
-            contents = await self.web_browser_engine.run(url)
-            content = contents.inner_text
+            content = await asyncio.to_thread(extract_static_text, data)
+            if content is None:
+                method = "browser"
+                stepper.display_content += f"DAVID(WEB_SUMMARIZER): {url} needs JavaScript, extracting contents with the browser engine.\n\n"
+                async with limiter(url):
+                    contents = await self.get_browser_engine().run(url)
+                content = contents.inner_text
+            else:
+                method = "static"
+                stepper.display_content += f"DAVID(WEB_SUMMARIZER): Extracted contents of {url} from static HTML.\n\n"
+            EXTRACTION_STATS.record(method)
+            logger.info(f"Extracted {url} via {method} ({EXTRACTION_STATS.summary()})")
 
         else:
-            contents = ""
-            fileStream = io.BytesIO(out.content)
-            reader = fitz.open("pdf", fileStream)
-            for page in reader:
-                contents += page.get_text() + "\n"
-            content = contents
-            reader.close()
+            content = await asyncio.to_thread(read_pdf, data)
+            method = "pdf"
+
+        self.extraction_methods[url] = method
+        return content
 
+    async def summarize_content(self, stepper, event, content: str, system_text: str, max_chunks: int = 3, url: str = "") -> list[str]:
+        """Summarize page content chunk by chunk with Alyssa(SummarizeOrSearch).
+
+        Near-duplicates of previously summarized pages reuse the stored summaries of their matching chunks, so only changed chunks are re-summarized.
+        """
         summaries = []
         prompt_template = WEB_BROWSE_AND_SUMMARIZE_PROMPT.format(content="{}")
         self.content = content
         chunk_summaries = []
 
         chunks = generate_prompt_chunk(content, prompt_template, "gpt-4", system_text, 4096)
-
-        role = SummarizeOrSearch(stepper=stepper, event=event, content=self.content,language="en-us")
+        chunks = [prompt for _, prompt in zip(range(max_chunks), chunks)]
+
+        index = get_summary_index() if self.use_summary_index and indexable(content) else None
+        match = None
+        if index is not None:
+            # Fingerprint the page text only, the shared prompt template would make unrelated pages look alike.
+            prefix, suffix = prompt_template.split("{}")
+            chunk_texts = [prompt.removeprefix(prefix).removesuffix(suffix) for prompt in chunks]
+            fingerprint, chunk_fingerprints = await asyncio.to_thread(lambda: (simhash(content), [simhash(text) for text in chunk_texts]))
+            # Summaries are only reused for the same action, chunk budget and response language.
+            variant = f"{self.name}:{max_chunks}:{self.language}"
+            match = index.lookup(fingerprint, variant)
+            if match is not None:
+                stepper.display_content += f"DAVID(WEB_SUMMARIZER): Page is a near-duplicate of {match.url} ({match.similarity:.0%} similar), reusing its summaries.\n\n"
+
+        role = SummarizeOrSearch(stepper=stepper, event=event, content=content,language="en-us")
         count = 0
         for prompt in chunks:
-            if count >= 3:
+            if count >= max_chunks:
                 break
-            stepper.display_content += f"DAVID(WEB_SUMMARIZER): Calling Alyssa(SummarizeOrSearch) with URL Contents.\n\n"
-            summary = await role.run(prompt)
-            chunk_summaries.append(summary.content)
+            reused = match.reusable_summary(chunk_fingerprints[count], index.similarity_threshold) if match is not None else None
+            if reused is not None:
+                chunk_summaries.append(reused)
+            else:
+                stepper.display_content += f"DAVID(WEB_SUMMARIZER): Calling Alyssa(SummarizeOrSearch) with URL Contents.\n\n"
+                summary = await role.run(prompt)
+                chunk_summaries.append(summary.content)
             count +=1
+
+        if index is not None:
+            index.store(url, fingerprint, variant, list(zip(chunk_fingerprints, chunk_summaries)), replace=match.fingerprint if match is not None else None)
         
         if len(chunk_summaries) == 1:
             summaries.append(chunk_summaries[0])
@@ -203,6 +405,148 @@ class URLSummarize(Action):
             for chunk in chunk_summaries:
                 summaries.append(chunk)
         return summaries
+class SiteCrawlSummarize(URLSummarize):
+    """Action class to crawl a website section and summarize the site as a whole."""
+
+    name: str = "SiteCrawlSummarize"
+    desc: str = "Crawl a whole website, docs site or blog section starting from a url and summarize the site as a whole."
+    max_depth: int = 2
+    max_pages: int = 50
+    max_queue: int = 10_000
+    workers: int = 4
+    min_interval: float = 1.0
+    same_origin: bool = True
+    respect_robots: bool = True
+    rollup_batch: int = 10
+    max_page_bytes: int = 5_000_000
+
+    async def run(
+        self,
+        stepper,
+        event,
+        url: str,
+        system_text: str | None,
+    ):
+        """Run the action to crawl a site and summarize it.
+
+        Args:
+            url: The query containing the URL to start crawling from.
+            system_text: The system text.
+
+        Returns:
+            A list with the site-level summary.
+        """
+        if system_text is None:
+            system_text  = SUMMARIZE_PROMPT
+
+        stepper.display_content += "DAVID(WEB_SUMMARIZER): Extracting start URL from query.\n\n"
+        urls = parse_urls(await self._aask(EXTRACT_URLS_PROMPT.format(query=url)))
+        if not urls:
+            return ["Couldn't get URL from the given query."]
+
+        robots = RobotsRules() if self.respect_robots else None
+        frontier = URLFrontier(urls[0], max_depth=self.max_depth, max_pages=self.max_pages, max_queue=self.max_queue, same_origin=self.same_origin, robots=robots)
+        limiter = HostRateLimiter(self.max_per_host, self.min_interval)
+        if not await frontier.add(urls[0], 0):
+            return ["Crawling the given URL is not allowed."]
+
+        stepper.display_content += f"DAVID(WEB_SUMMARIZER): Crawling {frontier.origin} (max depth {self.max_depth}, max pages {self.max_pages}).\n\n"
+        rollup = ""
+        pending = []
+        rollup_lock = asyncio.Lock()
+        crawled = 0
+
+        async def fold(batch: list[str]):
+            nonlocal rollup
+            async with rollup_lock:
+                stepper.display_content += f"DAVID(WEB_SUMMARIZER): Rolling {len(batch)} page summaries into the site summary.\n\n"
+                rollup = await self._aask(SITE_ROLLUP_PROMPT.format(rollup=rollup or "None yet.", pages="\n".join(batch)), [system_text])
+
+        async def worker():
+            nonlocal crawled
+            while (item := await frontier.next()) is not None:
+                page_url, depth = item
+                try:
+                    summary = await self.crawl_page(stepper, event, frontier, limiter, page_url, depth, system_text)
+                except Exception as e:
+                    logger.warning(f"Failed to crawl {page_url}: {e}")
+                    summary = ""
+                finally:
+                    frontier.done()
+                if not summary:
+                    continue
+                crawled += 1
+                stepper.display_content += f"DAVID(WEB_SUMMARIZER): [{crawled}/{frontier.scheduled}] {page_url}: {summary}\n\n"
+                pending.append(f"{page_url}: {summary}")
+                if len(pending) >= self.rollup_batch:
+                    batch = pending[:]
+                    pending.clear()
+                    await fold(batch)
+
+        await asyncio.gather(*[worker() for _ in range(self.workers)])
+        if pending:
+            await fold(pending)
+
+        if not rollup:
+            return ["Couldn't crawl any pages from the given URL."]
+        logger.info(f"Crawled {crawled} pages of {frontier.origin} ({EXTRACTION_STATS.summary()})")
+        return [rollup]
+
+    def download_page(self, url: str, allowed_origin: Optional[str] = None) -> Optional[tuple[requests.Response, bytes]]:
+        """Download a crawled page, skipping non-page content types and bodies over max_page_bytes without reading them fully.
+
+        Args:
+            url: The page to download.
+            allowed_origin: If set, pages that redirect to another origin are skipped.
+
+        Returns:
+            The response and its body, or None if the page was skipped.
+        """
+        with requests.get(url, timeout=30, stream=True, headers={"User-Agent": CRAWLER_USER_AGENT}) as out:
+            if allowed_origin is not None and origin(out.url) != allowed_origin:
+                return None
+            type = out.headers.get("content-type") or ""
+            if out.status_code != 200 or not any(accepted in type for accepted in CRAWL_CONTENT_TYPES):
+                return None
+            length = out.headers.get("content-length")
+            if length and length.isdigit() and int(length) > self.max_page_bytes:
+                return None
+            data = bytearray()
+            for block in out.iter_content(64 * 1024):
+                data += block
+                if len(data) > self.max_page_bytes:
+                    return None
+        return out, bytes(data)
+
+    async def crawl_page(self, stepper, event, frontier: URLFrontier, limiter: HostRateLimiter, url: str, depth: int, system_text: str) -> str:
+        """Fetch one page, queue its links and summarize it.
+
+        Returns:
+            The page summary, empty if the page could not be fetched.
+        """
+        if frontier.robots is not None:
+            # Honour each host's robots.txt Crawl-delay, its rules were loaded when the URL was queued.
+            limiter.set_interval(url, frontier.robots.crawl_delay(url))
+        allowed_origin = frontier.origin if frontier.same_origin else None
+        async with limiter(url):
+            try:
+                page = await asyncio.to_thread(self.download_page, url, allowed_origin)
+            except requests.RequestException as e:
+                print(f"Failed to fetch {url} in SiteCrawlSummarize(): {e}")
+                return ""
+        if page is None:
+            return ""
+        out, data = page
+        if depth < self.max_depth and 'text/html' in (out.headers.get("content-type") or ""):
+            for link in await asyncio.to_thread(extract_links, data, out.url):
+                await frontier.add(link, depth + 1)
+
+        content = await self.extract(stepper, url, out, limiter, data=data)
+        # Only the running counters are kept per page so memory stays bounded on large crawls.
+        self.extraction_methods.pop(url, None)
+        summaries = await self.summarize_content(stepper, event, content, system_text, max_chunks=1, url=url)
+        return " ".join(summaries)
+
 class Summarize(Action):
     name: str = "Summarize Tool"
     i_context: Optional[str] = None
@@ -281,7 +625,7 @@ class WebSummarizer(Role):
         self.image_base64 = file
         self.stepper = stepper
         self.event = event
-        self.set_actions([AnswerQuestion, URLSummarize])
+        self.set_actions([AnswerQuestion, URLSummarize, SiteCrawlSummarize])
         self._set_react_mode(RoleReactMode.REACT.value, 1)
 
         if self.language not in ("en-us", "zh-cn"):
@@ -294,8 +638,16 @@ class WebSummarizer(Role):
         todo = self.rc.todo
         msg = self.rc.memory.get(k=1)[0]
 
-        if isinstance(todo, URLSummarize):
+        if isinstance(todo, SiteCrawlSummarize):
+            research_system_text = f'Given this query containing a url: {msg.content}, summarize the site. Please respond in {self.language}.'
+            todo.language = self.language
+            self.stepper.display_content += f"DAVID(WEB_SUMMARIZER): TOOL: SiteCrawlSummarize. QUERY: '{research_system_text}'\n\n"
+            result = await todo.run(self.stepper, self.event, msg.content, research_system_text)
+            ret = Message(content = "\n".join(result), role = self.profile, cause_by = todo)
+
+        elif isinstance(todo, URLSummarize):
             research_system_text = f'Given this query containing a url: {msg.content}, get its summary. Please respond in {self.language}.'
+            todo.language = self.language
             self.stepper.display_content += f"DAVID(WEB_SUMMARIZER): TOOL: URLSummarize. QUERY: '{research_system_text}'\n\n"
             result = await todo.run(self.stepper, self.event, msg.content, research_system_text)
             ret = Message(content = "\n".join(result), role = self.profile, cause_by = todo)
@@ -3,31 +3,32 @@ import base64
 import io
 import threading
 
-import gradio as gr
-from acutracer.instrumentors.python.webapi.instrumentor import (
-    WebAPIInstrumentor,
-)
-from PIL import Image
+from startup import STARTUP_TIMER, prewarm
 
-from WebScraper import WebSummarizer
+with STARTUP_TIMER.step("import gradio"):
+    import gradio as gr
+
+with STARTUP_TIMER.step("import WebScraper"):
+    from WebScraper import WebSummarizer
 
 # Constants
-THEME = gr.themes.Base(
-    primary_hue="red",
-    secondary_hue="green",
-    neutral_hue="neutral",
-    ).set(
-        button_secondary_background_fill='*secondary_500',
-        button_secondary_background_fill_dark='*secondary_700',
-        button_secondary_background_fill_hover='*secondary_400',
-        button_secondary_background_fill_hover_dark='*secondary_500',
-        button_secondary_text_color='white',
-        button_cancel_background_fill='*neutral_500',
-        button_cancel_background_fill_dark='*neutral_700',
-        button_cancel_background_fill_hover='*neutral_400',
-        button_cancel_background_fill_hover_dark='*secondary_700',
-        button_cancel_border_color='*neutral_500'
-    )
+with STARTUP_TIMER.step("build theme"):
+    THEME = gr.themes.Base(
+        primary_hue="red",
+        secondary_hue="green",
+        neutral_hue="neutral",
+        ).set(
+            button_secondary_background_fill='*secondary_500',
+            button_secondary_background_fill_dark='*secondary_700',
+            button_secondary_background_fill_hover='*secondary_400',
+            button_secondary_background_fill_hover_dark='*secondary_500',
+            button_secondary_text_color='white',
+            button_cancel_background_fill='*neutral_500',
+            button_cancel_background_fill_dark='*neutral_700',
+            button_cancel_background_fill_hover='*neutral_400',
+            button_cancel_background_fill_hover_dark='*secondary_700',
+            button_cancel_border_color='*neutral_500'
+        )
 # End Constants
 
 class FunctionStepper:
@@ -191,6 +192,8 @@ class AgentInterface:
         Returns:
             Image in base64 encoding.
         """
+        from PIL import Image
+
         image = Image.open(image_path)
         image.thumbnail((300,300), Image.Resampling.LANCZOS)
         byters = io.BytesIO()
@@ -236,7 +239,7 @@ def build_application(interface: AgentInterface):
     Returns:
         None
     """
-    with gr.Blocks(fill_height = True, theme=THEME) as iface: ## Optional: add next button tied to go_next() for step-by-step execution.
+    with STARTUP_TIMER.step("build interface"), gr.Blocks(fill_height = True, theme=THEME) as iface: ## Optional: add next button tied to go_next() for step-by-step execution.
         gr.Markdown("<div style='text-align: center; font-size: 30px; font-weight: bold;'>LLM-Agent Demo</div>")
         gr.Markdown("<div style='text-align: center; font-size: 15px; font-weight: bold;'>Summarize Websites, Answer Questions.</div>")
 
@@ -287,21 +290,32 @@ def build_application(interface: AgentInterface):
         iface.load(lambda: interface.send_to_output(), None, outputs=outputs, every = 0.1)
         iface.load(lambda: interface.get_final_output(), None, outputs=final_output, every = 0.1)
 
-    # Initialize the WebAPIInstrumentor
-    instrumentor = WebAPIInstrumentor(name="gradio-llm-agent")
+    with STARTUP_TIMER.step("import acutracer"):
+        from acutracer.instrumentors.python.webapi.instrumentor import (
+            WebAPIInstrumentor,
+        )
 
-    # Apply instrumentation to the Gradio interface
-    instrumentor.instrument_gradio(iface)
+    with STARTUP_TIMER.step("instrument interface"):
+        # Initialize the WebAPIInstrumentor
+        instrumentor = WebAPIInstrumentor(name="gradio-llm-agent")
 
+        # Apply instrumentation to the Gradio interface
+        instrumentor.instrument_gradio(iface)
+
+    print(STARTUP_TIMER.report())
     iface.launch(server_port=7860, server_name="0.0.0.0")
 
 
 if __name__ == "__main__":
 
+## Optional: import heavy modules in the background, e.g. WEB_SUMMARIZER_PREWARM="fitz,PIL.Image"
+    prewarm()
+
 ## Initializing AgentInterface
-    stepper = FunctionStepper()
-    event = threading.Event()
-    interface = AgentInterface(event, stepper)
+    with STARTUP_TIMER.step("init AgentInterface"):
+        stepper = FunctionStepper()
+        event = threading.Event()
+        interface = AgentInterface(event, stepper)
 ## End initializing AgentInterface
 
 # Build Gradio App
@@ -0,0 +1,159 @@
+import threading
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+# Tags that never carry article content.
+BOILERPLATE_TAGS = ["script", "style", "template", "svg", "canvas", "iframe", "form", "button"]
+
+# Site chrome, removed only at page level so titles in <article><header> survive.
+PAGE_CHROME_TAGS = ["nav", "header", "footer", "aside"]
+CONTENT_CONTAINER_TAGS = ["article", "main"]
+
+# Common main-content containers, checked in order. A lone <article> is checked after these.
+MAIN_CONTENT_SELECTORS = ["main", "[role=main]"]
+FALLBACK_CONTENT_SELECTORS = ["#mw-content-text", "#content", "#main", ".post-content", ".entry-content"]
+
+# Ids of empty mount points used by client-side rendered apps.
+JS_APP_ROOT_IDS = ("root", "app", "__next", "__nuxt", "svelte")
+
+MIN_STATIC_TEXT_LENGTH = 200
+MIN_APP_SCRIPT_COUNT = 3
+
+class ExtractionStats:
+    """
+    ExtractionStats counts which extraction path was used for each HTML page so the browser-avoidance rate can be tracked.
+    """
+    def __init__(self):
+        """
+        Initialize extraction counters.
+
+        Returns:
+            None
+        """
+        self._lock = threading.Lock()
+        self.static = 0
+        self.browser = 0
+
+    def record(self, method: str):
+        """
+        Record one extraction.
+
+        Args:
+            method: The extraction path used, either 'static' or 'browser'.
+        Returns:
+            None
+        """
+        with self._lock:
+            if method == "static":
+                self.static += 1
+            else:
+                self.browser += 1
+
+    @property
+    def browser_avoidance_rate(self) -> float:
+        """
+        Returns:
+            float: Fraction of HTML pages extracted without the browser engine.
+        """
+        total = self.static + self.browser
+        if total == 0:
+            return 0.0
+        return self.static / total
+
+    def summary(self) -> str:
+        """
+        Returns:
+            str: One line describing the counters.
+        """
+        return f"static={self.static} browser={self.browser} browser_avoidance_rate={self.browser_avoidance_rate:.2%}"
+
+EXTRACTION_STATS = ExtractionStats()
+
+def _visible_text(node) -> str:
+    lines = (line.strip() for line in node.get_text(separator="\n").splitlines())
+    return "\n".join(line for line in lines if line)
+
+def _is_page_chrome(tag) -> bool:
+    return tag.find_parent(CONTENT_CONTAINER_TAGS) is None and tag.find_parent(attrs={"role": "main"}) is None
+
+def _pick_main_node(soup: BeautifulSoup):
+    candidates = [soup.select_one(selector) for selector in MAIN_CONTENT_SELECTORS]
+    # Listing pages hold many articles; only a single one is the page's content.
+    articles = soup.find_all("article")
+    if len(articles) == 1:
+        candidates.append(articles[0])
+    candidates += [soup.select_one(selector) for selector in FALLBACK_CONTENT_SELECTORS]
+    for node in candidates:
+        if node is not None and len(node.get_text(strip=True)) >= MIN_STATIC_TEXT_LENGTH:
+            return node
+
+    # No known container, pick the block with the most paragraph text.
+    best, best_score = None, 0
+    for node in soup.find_all(["div", "section"]):
+        score = sum(len(p.get_text(strip=True)) for p in node.find_all("p", recursive=False))
+        if score > best_score:
+            best, best_score = node, score
+    if best is not None and best_score >= MIN_STATIC_TEXT_LENGTH:
+        return best
+    return soup.body or soup
+
+def extract_static_text(html: str | bytes) -> str | None:
+    """
+    Extract the main text content of an already-fetched HTML page without a browser.
+
+    Args:
+        html: The raw HTML of the page.
+    Returns:
+        The extracted text, or None if the page looks like it needs JavaScript to render its content.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    body = soup.body
+    if body is None:
+        return None
+
+    noscript_text = " ".join(tag.get_text(" ", strip=True) for tag in body.find_all("noscript"))
+    script_count = len(soup.find_all("script", src=True))
+    for tag in body.find_all(BOILERPLATE_TAGS + ["noscript"]):
+        tag.decompose()
+    for tag in [tag for tag in body.find_all(PAGE_CHROME_TAGS) if _is_page_chrome(tag)]:
+        tag.decompose()
+
+    body_text = body.get_text(strip=True)
+    if not body_text:
+        return None
+
+    # Only short pages are suspect; long static text is kept even if a widget mounts client-side.
+    if len(body_text) < MIN_STATIC_TEXT_LENGTH:
+        # Content only present in <noscript> means the real page is drawn by JavaScript.
+        # A short page that loads several scripts is most likely filled in client-side.
+        if noscript_text or script_count >= MIN_APP_SCRIPT_COUNT:
+            return None
+        for root_id in JS_APP_ROOT_IDS:
+            root = body.find(id=root_id)
+            if root is not None and not root.get_text(strip=True):
+                return None
+
+    text = _visible_text(_pick_main_node(soup))
+    if not text:
+        return None
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    if title and not text.startswith(title):
+        text = title + "\n" + text
+    return text
+
+def extract_links(html: str | bytes, base_url: str) -> list[str]:
+    """
+    Get the absolute URLs of every link on a page.
+
+    Args:
+        html: The raw HTML of the page.
+        base_url: The URL the page was fetched from.
+    Returns:
+        A list of absolute URLs.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    base = soup.find("base", href=True)
+    if base is not None:
+        base_url = urljoin(base_url, base["href"])
+    return [urljoin(base_url, a["href"]) for a in soup.find_all("a", href=True)]
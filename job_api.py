@@ -0,0 +1,359 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from startup import STARTUP_TIMER
+
+with STARTUP_TIMER.step("import fastapi"):
+    from fastapi import FastAPI, HTTPException
+    from fastapi.responses import StreamingResponse
+    from pydantic import BaseModel
+
+with STARTUP_TIMER.step("import WebScraper"):
+    from WebScraper import WebSummarizer
+
+# Constants
+DB_PATH = os.environ.get("JOB_API_DB", "jobs.db")
+WORKERS = int(os.environ.get("JOB_API_WORKERS", "2"))
+PORT = int(os.environ.get("JOB_API_PORT", "8000"))
+RETENTION_DAYS = float(os.environ.get("JOB_API_RETENTION_DAYS", "7"))
+MAX_ATTEMPTS = int(os.environ.get("JOB_API_MAX_ATTEMPTS", "3"))
+PRUNE_INTERVAL = 3600
+MAX_BULK_JOBS = 100
+SSE_POLL_INTERVAL = 0.5
+# End Constants
+
+class JobStore:
+    """
+    JobStore is a persistent job queue backed by SQLite, so queued jobs survive restarts.
+    """
+    def __init__(self, path: str = DB_PATH):
+        """
+        Open (or create) the job database.
+
+        Args:
+            path: Path to the SQLite file.
+        Returns:
+            None
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    log TEXT NOT NULL DEFAULT '',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+            if "attempts" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (updated_at)")
+
+    def submit(self, queries: list[str]) -> list[str]:
+        """
+        Queue one job per query.
+
+        Args:
+            queries: The URLs/prompts to run.
+        Returns:
+            The new job ids, in the same order.
+        """
+        now = time.time()
+        ids = [uuid.uuid4().hex for _ in queries]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO jobs (id, query, status, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?)",
+                [(job_id, query, now, now) for job_id, query in zip(ids, queries)],
+            )
+        return ids
+
+    def claim(self) -> Optional[sqlite3.Row]:
+        """
+        Mark the oldest queued job as running and count the attempt.
+
+        Returns:
+            The claimed job, or None if the queue is empty.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                job = self._conn.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1").fetchone()
+                if job is not None:
+                    self._conn.execute("UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?", (time.time(), job["id"]))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return job
+
+    def finish(self, job_id: str, log: str, result: str | None = None, error: str | None = None):
+        """
+        Store a job's outcome.
+
+        Args:
+            job_id: The job to update.
+            log: The job's full stepper log.
+            result: The agent output if the job succeeded.
+            error: The error message if the job failed.
+        Returns:
+            None
+        """
+        status = "failed" if error is not None else "done"
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, log = ?, updated_at = ? WHERE id = ?",
+                (status, result, error, log, time.time(), job_id),
+            )
+
+    def requeue_running(self, max_attempts: int = MAX_ATTEMPTS) -> int:
+        """
+        Put jobs left running by a previous process back in the queue.
+        Jobs that already used max_attempts are marked failed instead, so a job that crashes the process cannot loop forever.
+
+        Args:
+            max_attempts: Number of runs a job gets before it is given up on.
+        Returns:
+            The number of requeued jobs.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE status = 'running' AND attempts >= ?",
+                (f"Job was interrupted {max_attempts} times, giving up.", now, max_attempts),
+            )
+            return self._conn.execute("UPDATE jobs SET status = 'queued', updated_at = ? WHERE status = 'running'", (now,)).rowcount
+
+    def prune(self, retention_days: float = RETENTION_DAYS) -> int:
+        """
+        Delete finished jobs older than the retention period.
+
+        Args:
+            retention_days: How long finished jobs and their logs are kept.
+        Returns:
+            The number of deleted jobs.
+        """
+        cutoff = time.time() - retention_days * 86400
+        with self._lock:
+            return self._conn.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?", (cutoff,)).rowcount
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        Returns:
+            dict: The job's fields, or None if it does not exist.
+        """
+        with self._lock:
+            job = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(job) if job is not None else None
+
+class JobStepper:
+    """
+    JobStepper stands in for the UI's FunctionStepper and collects a job's progress log.
+    """
+    def __init__(self):
+        self.state = 0
+        self.display_content = ""
+
+    def get_output(self) -> str:
+        return self.display_content
+
+class JobWorkers:
+    """
+    JobWorkers runs queued jobs through the WebSummarizer pipeline on a pool of threads.
+    """
+    def __init__(self, store: JobStore, concurrency: int = WORKERS):
+        self.store = store
+        self.concurrency = concurrency
+        self.steppers: dict[str, JobStepper] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._prune_lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def start(self):
+        """
+        Requeue interrupted jobs and start the worker threads.
+
+        Returns:
+            None
+        """
+        requeued = self.store.requeue_running()
+        if requeued:
+            print(f"Requeued {requeued} interrupted jobs.")
+        self._maybe_prune()
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._loop, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """
+        Stop the workers once their current jobs finish.
+
+        Returns:
+            None
+        """
+        self._stop.set()
+        self._wake.set()
+
+    def notify(self):
+        """
+        Wake idle workers after new jobs are submitted.
+
+        Returns:
+            None
+        """
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            job = self.store.claim()
+            if job is None:
+                self._maybe_prune()
+                self._wake.wait(timeout=1.0)
+                self._wake.clear()
+                continue
+            self._run(job["id"], job["query"])
+
+    def _run(self, job_id: str, query: str):
+        stepper = JobStepper()
+        self.steppers[job_id] = stepper
+        stepper.display_content = "Starting Execution...\n\n"
+        try:
+            out = asyncio.run(WebSummarizer(stepper=stepper, event=threading.Event(), file=None).run(query))
+            self.store.finish(job_id, stepper.display_content, result=getattr(out, "content", str(out)))
+        # SystemExit too: AnswerQuestion.completion calls exit(1) on config errors, which would otherwise kill the worker.
+        except (Exception, SystemExit) as e:
+            self.store.finish(job_id, stepper.display_content, error=str(e) or type(e).__name__)
+        finally:
+            self.steppers.pop(job_id, None)
+
+    def _maybe_prune(self):
+        if not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            if time.time() - self._last_prune >= PRUNE_INTERVAL:
+                self._last_prune = time.time()
+                pruned = self.store.prune()
+                if pruned:
+                    print(f"Pruned {pruned} finished jobs.")
+        finally:
+            self._prune_lock.release()
+
+    def log(self, job_id: str, job: dict) -> str:
+        """
+        Returns:
+            str: The live log of a running job, or the stored log otherwise.
+        """
+        stepper = self.steppers.get(job_id)
+        return stepper.get_output() if stepper is not None else job["log"]
+
+class JobRequest(BaseModel):
+    query: Optional[str] = None
+    queries: Optional[list[str]] = None
+
+def job_view(job: dict, log: str) -> dict:
+    return {
+        "id": job["id"],
+        "query": job["query"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+        "log": log,
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
+
+def build_api(store: JobStore, workers: JobWorkers) -> FastAPI:
+    """
+    Build the job API around a store and worker pool.
+
+    Args:
+        store: The persistent job queue.
+        workers: The pool that runs queued jobs.
+    Returns:
+        The FastAPI application.
+    """
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        workers.start()
+        print(STARTUP_TIMER.report())
+        yield
+        workers.stop()
+
+    api = FastAPI(title="Web Summarizer Jobs", lifespan=lifespan)
+
+    @api.post("/jobs", status_code=202)
+    def submit_jobs(request: JobRequest):
+        queries = list(request.queries or [])
+        if request.query:
+            queries.insert(0, request.query)
+        queries = [query for query in queries if query and query.strip()]
+        if not queries:
+            raise HTTPException(status_code=400, detail="Provide 'query' or 'queries'.")
+        if len(queries) > MAX_BULK_JOBS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_JOBS} queries per request.")
+        job_ids = store.submit(queries)
+        workers.notify()
+        return {"job_ids": job_ids}
+
+    @api.get("/jobs/{job_id}")
+    def get_job(job_id: str):
+        job = store.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found.")
+        return job_view(job, workers.log(job_id, job))
+
+    @api.get("/jobs/{job_id}/events")
+    async def job_events(job_id: str):
+        if store.get(job_id) is None:
+            raise HTTPException(status_code=404, detail="Job not found.")
+
+        async def stream():
+            sent_log = 0
+            sent_status = None
+            while True:
+                job = await asyncio.to_thread(store.get, job_id)
+                log = workers.log(job_id, job)
+                if job["status"] != sent_status:
+                    sent_status = job["status"]
+                    yield f"event: status\ndata: {json.dumps({'status': sent_status})}\n\n"
+                if len(log) > sent_log:
+                    yield f"event: log\ndata: {json.dumps({'text': log[sent_log:]})}\n\n"
+                    sent_log = len(log)
+                if sent_status in ("done", "failed"):
+                    yield f"event: result\ndata: {json.dumps(job_view(job, log))}\n\n"
+                    return
+                await asyncio.sleep(SSE_POLL_INTERVAL)
+
+        return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    return api
+
+if __name__ == "__main__":
+    import uvicorn
+
+## Initializing job queue
+    with STARTUP_TIMER.step("init JobStore"):
+        store = JobStore()
+        workers = JobWorkers(store)
+## End initializing job queue
+
+    uvicorn.run(build_api(store, workers), host="0.0.0.0", port=PORT)
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from pydantic import BaseModel
+
+# Constants
+INDEX_PATH = os.environ.get("SUMMARY_INDEX_DB", "summary_index.db")
+MAX_ENTRIES = int(os.environ.get("SUMMARY_INDEX_MAX_ENTRIES", "5000"))
+SIMILARITY_THRESHOLD = float(os.environ.get("SUMMARY_SIMILARITY", "0.82"))
+FINGERPRINT_BITS = 64
+# 12 bands guarantee every page within 11 differing bits (similarity >= 0.82) shares at least one band.
+BANDS = 12
+BAND_WIDTHS = [FINGERPRINT_BITS // BANDS + (1 if i < FINGERPRINT_BITS % BANDS else 0) for i in range(BANDS)]
+# Bump when the band layout or fingerprint changes; older index files are rebuilt.
+INDEX_VERSION = 2
+# Word pairs: single words make unrelated pages look alike, longer shingles make small edits look large.
+SHINGLE_SIZE = 2
+MIN_WORDS = 50
+# End Constants
+
+WORD_PATTERN = re.compile(r"\w+")
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> int:
+    """
+    Compute a 64-bit SimHash fingerprint of a text. Texts that differ by a few words get fingerprints that differ by a few bits.
+
+    Args:
+        text: The text to fingerprint.
+        shingle_size: Number of consecutive words hashed together.
+    Returns:
+        The fingerprint as an unsigned 64-bit integer.
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    shingles = [" ".join(words[i:i + shingle_size]) for i in range(max(1, len(words) - shingle_size + 1))]
+    weights = [0] * FINGERPRINT_BITS
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(FINGERPRINT_BITS) if weights[bit] > 0)
+
+def similarity(a: int, b: int) -> float:
+    """
+    Returns:
+        float: Fraction of fingerprint bits two fingerprints share.
+    """
+    return 1 - bin(a ^ b).count("1") / FINGERPRINT_BITS
+
+def _bands(fingerprint: int) -> list[int]:
+    bands, offset = [], 0
+    for width in BAND_WIDTHS:
+        bands.append(fingerprint >> offset & ((1 << width) - 1))
+        offset += width
+    return bands
+
+def _to_signed(fingerprint: int) -> int:
+    # SQLite integers are signed 64-bit.
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+def _to_unsigned(fingerprint: int) -> int:
+    return fingerprint & ((1 << 64) - 1)
+
+class IndexedPage(BaseModel):
+    url: str
+    fingerprint: int
+    similarity: float
+    chunks: list[tuple[int, str]]
+
+    def reusable_summary(self, fingerprint: int, threshold: float) -> Optional[str]:
+        """
+        Find the summary of the stored chunk most similar to a new chunk.
+
+        Args:
+            fingerprint: SimHash of the new chunk's text.
+            threshold: Minimum similarity for the stored summary to be reused.
+        Returns:
+            The stored chunk summary, or None if the chunk changed too much and must be re-summarized.
+        """
+        best, best_similarity = None, threshold
+        for chunk_fingerprint, summary in self.chunks:
+            score = similarity(fingerprint, chunk_fingerprint)
+            if score >= best_similarity:
+                best, best_similarity = summary, score
+        return best
+
+class SummaryIndex:
+    """
+    SummaryIndex stores past page summaries by SimHash fingerprint so near-duplicate pages can reuse them.
+    Entries are scoped by a variant string (action, chunk budget, language) so summaries made for a different purpose are never served.
+
+    Lookups use banded LSH: the fingerprint is split into 12 bands of 5-6 bits and any page sharing a band is a candidate.
+    By the pigeonhole principle that finds every page within 11 differing bits (similarity >= 0.82, the default threshold);
+    lower thresholds are matched best-effort.
+    """
+    def __init__(self, path: str = INDEX_PATH, max_entries: int = MAX_ENTRIES, similarity_threshold: float = SIMILARITY_THRESHOLD):
+        """
+        Open (or create) the index.
+
+        Args:
+            path: Path to the SQLite file.
+            max_entries: Number of pages kept; the least recently used are evicted.
+            similarity_threshold: Minimum similarity for a page to count as a near-duplicate.
+        Returns:
+            None
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        bands = ", ".join(f"b{i} INTEGER NOT NULL" for i in range(BANDS))
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+                # The index is only a cache, entries from an older layout are dropped rather than migrated.
+                self._conn.execute("DROP TABLE IF EXISTS pages")
+                self._conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+            self._conn.execute(
+                f"""CREATE TABLE IF NOT EXISTS pages (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    fingerprint INTEGER NOT NULL,
+                    variant TEXT NOT NULL DEFAULT '',
+                    {bands},
+                    chunks TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            for i in range(BANDS):
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS pages_b{i} ON pages (b{i})")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pages_last_used ON pages (last_used)")
+
+    def lookup(self, fingerprint: int, variant: str) -> Optional[IndexedPage]:
+        """
+        Find the most similar stored page.
+
+        Args:
+            fingerprint: SimHash of the new page's text.
+            variant: Only pages stored with the same variant are considered.
+        Returns:
+            The stored page, or None if none is within the similarity threshold.
+        """
+        where = " OR ".join(f"b{i} = ?" for i in range(BANDS))
+        with self._lock:
+            rows = self._conn.execute(f"SELECT id, url, fingerprint, chunks FROM pages WHERE variant = ? AND ({where})", [variant, *_bands(fingerprint)]).fetchall()
+            best, best_similarity = None, self.similarity_threshold
+            for row in rows:
+                score = similarity(fingerprint, _to_unsigned(row[2]))
+                if score >= best_similarity:
+                    best, best_similarity = row, score
+            if best is None:
+                return None
+            self._conn.execute("UPDATE pages SET last_used = ? WHERE id = ?", (time.time(), best[0]))
+        return IndexedPage(url=best[1], fingerprint=_to_unsigned(best[2]), similarity=best_similarity, chunks=[tuple(c) for c in json.loads(best[3])])
+
+    def store(self, url: str, fingerprint: int, variant: str, chunks: list[tuple[int, str]], replace: Optional[int] = None):
+        """
+        Store a page's chunk fingerprints and summaries, evicting the least recently used pages over max_entries.
+
+        Args:
+            url: The page URL.
+            fingerprint: SimHash of the page's text.
+            variant: The action, chunk budget and language the summaries were made for.
+            chunks: (chunk fingerprint, chunk summary) pairs in page order.
+            replace: Fingerprint of a near-duplicate entry to overwrite instead of adding a new one.
+        Returns:
+            None
+        """
+        values = [url, _to_signed(fingerprint), variant, *_bands(fingerprint), json.dumps(chunks), time.time()]
+        columns = ", ".join(["url", "fingerprint", "variant", *[f"b{i}" for i in range(BANDS)], "chunks", "last_used"])
+        with self._lock:
+            if replace is not None:
+                self._conn.execute("DELETE FROM pages WHERE fingerprint = ? AND variant = ?", (_to_signed(replace), variant))
+            self._conn.execute(f"INSERT INTO pages ({columns}) VALUES ({', '.join('?' * len(values))})", values)
+            self._conn.execute(
+                "DELETE FROM pages WHERE id IN (SELECT id FROM pages ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_summary_index() -> Optional[SummaryIndex]:
+    """
+    Returns:
+        SummaryIndex: The shared index, opened on first use, or None if SUMMARY_INDEX_DB is set to an empty string.
+    """
+    global _index
+    if not INDEX_PATH:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = SummaryIndex()
+    return _index
+
+def indexable(text: str) -> bool:
+    """
+    Returns:
+        bool: True if the text is long enough for its fingerprint to be meaningful.
+    """
+    return len(WORD_PATTERN.findall(text)) >= MIN_WORDS
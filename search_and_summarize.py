@@ -5,15 +5,13 @@
 @Author  : alexanderwu
 @File    : search_google.py
 """
-from typing import Optional
+from typing import Any, Optional
 
 import pydantic
-from pydantic import model_validator
 
 from metagpt.actions import Action
 from metagpt.logs import logger
 from metagpt.schema import Message
-from metagpt.tools.search_engine import SearchEngine
 
 SEARCH_AND_SUMMARIZE_SYSTEM = """### Requirements
 1. Please summarize the latest dialogue based on the reference information(primary) and dialogue history. Do not include text that is irrelevant to the conversation.
@@ -111,23 +109,22 @@ Your response should only contain your search query as raw text and nothing else
 class SearchAndSummarize(Action):
     name: str = ""
     content: Optional[str] = None
-    search_engine: SearchEngine = None
+    search_engine: Any = None  # SearchEngine, created on first run
     result: str = ""
 
-    @model_validator(mode="after")
-    def validate_search_engine(self):
+    def get_search_engine(self):
         if self.search_engine is None:
+            from metagpt.tools.search_engine import SearchEngine
+
             try:
                 config = self.config
-                search_engine = SearchEngine.from_search_config(config.search, proxy=config.proxy)
+                self.search_engine = SearchEngine.from_search_config(config.search, proxy=config.proxy)
             except pydantic.ValidationError:
-                search_engine = None
-
-            self.search_engine = search_engine
-        return self
+                self.search_engine = None
+        return self.search_engine
 
     async def run(self, context: list[Message], stepper, system_text=SEARCH_AND_SUMMARIZE_SYSTEM) -> str:
-        if self.search_engine is None:
+        if self.get_search_engine() is None:
             logger.warning("Configure one of SERPAPI_API_KEY, SERPER_API_KEY, GOOGLE_API_KEY to unlock full feature")
             return ""
         stepper.display_content += f"ALYSSA(SUMMARIZE_OR_SEARCH): Extracting URL from user query and conducting web search. \n\n"
@@ -0,0 +1,270 @@
+import asyncio
+import hashlib
+import math
+import time
+from collections import deque
+from urllib.parse import urldefrag, urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+CRAWLER_USER_AGENT = "WebSummarizer"
+
+# Extensions of links that are never pages worth summarizing.
+SKIPPED_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico", ".bmp", ".tif", ".tiff",
+    ".zip", ".tar", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".whl", ".jar", ".dmg", ".exe", ".msi", ".deb", ".rpm", ".iso",
+    ".mp3", ".wav", ".ogg", ".flac", ".mp4", ".mov", ".avi", ".mkv", ".webm",
+    ".css", ".js", ".json", ".xml", ".rss", ".woff", ".woff2", ".ttf", ".otf", ".eot",
+    ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".csv",
+)
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different spellings of a page are visited once.
+
+    Args:
+        url: The URL to normalize.
+    Returns:
+        The URL without its fragment, with a lowercase scheme and host.
+    """
+    url, _ = urldefrag(url)
+    parts = urlparse(url)
+    return parts._replace(scheme=parts.scheme.lower(), netloc=parts.netloc.lower(), path=parts.path or "/").geturl()
+
+def origin(url: str) -> str:
+    """
+    Returns:
+        str: The scheme and host of the URL.
+    """
+    parts = urlparse(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+class BloomFilter:
+    """
+    BloomFilter is a fixed-size visited set: memory does not grow with the number of URLs, at the cost of rare false positives.
+    """
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        """
+        Size the filter for the expected number of items.
+
+        Args:
+            capacity: Expected number of items.
+            error_rate: Acceptable false positive rate at capacity.
+        Returns:
+            None
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> bool:
+        """
+        Add an item.
+
+        Args:
+            item: The item to add.
+        Returns:
+            True if the item was not already present.
+        """
+        added = False
+        for pos in self._positions(item):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos // 8] & (1 << (pos % 8)) for pos in self._positions(item))
+
+class RobotsRules:
+    """
+    RobotsRules fetches and caches robots.txt for each origin.
+    """
+    def __init__(self, user_agent: str = CRAWLER_USER_AGENT):
+        self.user_agent = user_agent
+        self._parsers: dict[str, RobotFileParser | None] = {}
+        self._lock = asyncio.Lock()
+
+    def _load(self, site: str) -> RobotFileParser | None:
+        # Follows RFC 9309: an unreachable robots.txt (network error, 5xx) or one behind
+        # authentication (401/403) disallows the site, any other 4xx allows it.
+        parser = RobotFileParser()
+        try:
+            resp = requests.get(f"{site}/robots.txt", timeout=10, headers={"User-Agent": self.user_agent})
+        except requests.RequestException:
+            parser.disallow_all = True
+            return parser
+        if resp.status_code in (401, 403) or resp.status_code >= 500:
+            parser.disallow_all = True
+            return parser
+        if resp.status_code != 200:
+            return None
+        parser.parse(resp.text.splitlines())
+        return parser
+
+    async def allowed(self, url: str) -> bool:
+        """
+        Args:
+            url: The URL about to be crawled.
+        Returns:
+            False if the site's robots.txt disallows the URL or could not be read.
+        """
+        site = origin(url)
+        async with self._lock:
+            if site not in self._parsers:
+                self._parsers[site] = await asyncio.to_thread(self._load, site)
+        parser = self._parsers[site]
+        return parser is None or parser.can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url: str) -> float:
+        """
+        Returns:
+            float: The Crawl-delay for the URL's site in seconds, 0 if unknown.
+        """
+        parser = self._parsers.get(origin(url))
+        delay = parser.crawl_delay(self.user_agent) if parser is not None else None
+        return float(delay or 0)
+
+class _HostSlot:
+    def __init__(self, semaphore: asyncio.Semaphore, limiter: "HostRateLimiter", host: str):
+        self.semaphore = semaphore
+        self.limiter = limiter
+        self.host = host
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        await self.limiter._wait_turn(self.host)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+class HostRateLimiter:
+    """
+    HostRateLimiter caps concurrent requests per host and spaces them out by a minimum interval.
+    It can be used anywhere URLSummarize expects a HostLimiter.
+    """
+    def __init__(self, max_per_host: int = 2, min_interval: float = 1.0):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._next_time: dict[str, float] = {}
+        self._intervals: dict[str, float] = {}
+
+    def set_interval(self, url: str, interval: float):
+        """
+        Raise the interval for one host, e.g. to honour a robots.txt Crawl-delay.
+
+        Args:
+            url: Any URL on the host.
+            interval: Minimum seconds between requests.
+        Returns:
+            None
+        """
+        host = urlparse(url).netloc.lower()
+        self._intervals[host] = max(interval, self.min_interval)
+
+    async def _wait_turn(self, host: str):
+        now = time.monotonic()
+        start = max(now, self._next_time.get(host, now))
+        self._next_time[host] = start + self._intervals.get(host, self.min_interval)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def __call__(self, url: str) -> _HostSlot:
+        """
+        Args:
+            url: The URL about to be requested.
+        Returns:
+            An async context manager that holds the host's slot.
+        """
+        host = urlparse(url).netloc.lower()
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return _HostSlot(self._semaphores[host], self, host)
+
+class URLFrontier:
+    """
+    URLFrontier holds the URLs left to crawl, enforcing depth, page, queue size, same-origin and robots.txt limits.
+    """
+    def __init__(self, start_url: str, max_depth: int = 2, max_pages: int = 50, max_queue: int = 10_000, same_origin: bool = True, robots: RobotsRules | None = None):
+        self.start_url = normalize_url(start_url)
+        self.origin = origin(self.start_url)
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.max_queue = max_queue
+        self.same_origin = same_origin
+        self.robots = robots
+        self.visited = BloomFilter(capacity=max(1000, max_pages * 20))
+        self.scheduled = 0
+        self.queue: deque[tuple[str, int]] = deque()
+        self._pending = 0
+        self._changed = asyncio.Event()
+
+    async def add(self, url: str, depth: int) -> bool:
+        """
+        Schedule a URL if it passes every frontier rule.
+
+        Args:
+            url: The URL to crawl.
+            depth: Link distance from the start URL.
+        Returns:
+            True if the URL was scheduled.
+        """
+        if depth > self.max_depth or self.scheduled >= self.max_pages or len(self.queue) >= self.max_queue:
+            return False
+        url = normalize_url(url)
+        parts = urlparse(url)
+        if parts.scheme not in ("http", "https") or parts.path.lower().endswith(SKIPPED_EXTENSIONS):
+            return False
+        if self.same_origin and origin(url) != self.origin:
+            return False
+        if url in self.visited:
+            return False
+        if self.robots is not None and not await self.robots.allowed(url):
+            return False
+        if not self.visited.add(url):
+            return False
+        self.queue.append((url, depth))
+        self.scheduled += 1
+        self._changed.set()
+        return True
+
+    async def next(self) -> tuple[str, int] | None:
+        """
+        Wait for the next URL to crawl.
+
+        Returns:
+            A (url, depth) tuple, or None once the queue is empty and no page in flight can add more.
+        """
+        while True:
+            if self.queue:
+                self._pending += 1
+                return self.queue.popleft()
+            if self._pending == 0:
+                self._changed.set()
+                return None
+            self._changed.clear()
+            await self._changed.wait()
+
+    def done(self):
+        """
+        Mark a page returned by next() as finished.
+
+        Returns:
+            None
+        """
+        self._pending -= 1
+        self._changed.set()
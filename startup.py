@@ -0,0 +1,105 @@
+import importlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+PREWARM_ENV = "WEB_SUMMARIZER_PREWARM"
+
+class StartupTimer:
+    """
+    StartupTimer records how long each import and initialization step takes so cold-start regressions are visible.
+    Steps opened inside another step are reported indented under it and are not counted again in the top-level sum.
+    """
+    def __init__(self):
+        """
+        Initialize the timer. Time is measured from when this module is first imported.
+
+        Returns:
+            None
+        """
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started = time.perf_counter()
+        # [name, depth, seconds or None while running]
+        self.steps: list[list] = []
+        self.background: list[list] = []
+
+    @contextmanager
+    def step(self, name: str, background: bool = False):
+        """
+        Time the body of a with-block as one startup step.
+
+        Args:
+            name: Label shown in the report.
+            background: True for steps run off the startup path (e.g. prewarm), reported separately.
+        Returns:
+            None
+        """
+        depth = getattr(self._local, "depth", 0)
+        record = [name, depth, None]
+        with self._lock:
+            (self.background if background else self.steps).append(record)
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record[2] = time.perf_counter() - start
+            self._local.depth = depth
+
+    def report(self) -> str:
+        """
+        Build the startup-time report.
+
+        Returns:
+            str: One line per step, nested steps indented, followed by the top-level sum, the total time since startup and any background steps.
+        """
+        with self._lock:
+            steps = [list(record) for record in self.steps]
+            background = [list(record) for record in self.background]
+        width = max((len(name) + 2 * depth for name, depth, _ in steps + background), default=0)
+        width = max(width, len("sum of top-level steps"))
+
+        def line(name, depth, seconds):
+            label = ("  " * depth + name).ljust(width)
+            value = f"{seconds * 1000:8.1f} ms" if seconds is not None else " running"
+            return f"  {label}  {value}"
+
+        lines = ["Startup time report:"]
+        lines += [line(*record) for record in steps]
+        top_level = sum(seconds for _, depth, seconds in steps if depth == 0 and seconds is not None)
+        lines.append(line("sum of top-level steps", 0, top_level))
+        lines.append(line("total", 0, time.perf_counter() - self.started))
+        if background:
+            lines.append("Background steps (not part of the startup path):")
+            lines += [line(*record) for record in background]
+        return "\n".join(lines)
+
+STARTUP_TIMER = StartupTimer()
+
+def prewarm(modules: list[str] | None = None) -> threading.Thread | None:
+    """
+    Import heavy modules in a background thread so the first request does not pay for them.
+
+    Args:
+        modules: Module names to import. Defaults to the comma-separated WEB_SUMMARIZER_PREWARM env var (e.g. "fitz,PIL.Image").
+    Returns:
+        The started thread, or None if there is nothing to prewarm.
+    """
+    if modules is None:
+        modules = [name.strip() for name in os.environ.get(PREWARM_ENV, "").split(",") if name.strip()]
+    if not modules:
+        return None
+
+    def load():
+        for name in modules:
+            with STARTUP_TIMER.step(f"prewarm {name}", background=True):
+                try:
+                    importlib.import_module(name)
+                except ImportError as e:
+                    print(f"Failed to prewarm {name}: {e}")
+
+    thread = threading.Thread(target=load, daemon=True)
+    thread.start()
+    return thread